@@ -0,0 +1,99 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import time
+
+from sample_data import HttpNeptuneQueries
+
+# (label, compression, projection) - the first entry is the baseline
+CONFIGURATIONS = [
+    ('baseline', 'identity', False),
+    ('gzip', 'gzip', False),
+    ('projection', 'identity', True),
+    ('gzip+projection', 'gzip', True),
+]
+
+# (label, query method, args) - read queries that return one row per element
+WORKLOAD = [
+    ('all_users', 'get_all_users', ()),
+    ('all_products', 'get_all_products', ()),
+    ('user_purchases', 'get_user_purchases', ('user1',)),
+    ('friends_purchases', 'get_friends_purchases', ('user1',)),
+    ('popular_products', 'get_popular_products', ()),
+    ('products_by_category', 'get_products_by_category', ('Electronics',)),
+]
+
+
+def measure(queries, method, args, iterations):
+    """Run a query method repeatedly, returning rows, wire bytes and latencies"""
+    client = queries.client
+    latencies = []
+    rows = 0
+    received = client.bytes_received
+    for _ in range(iterations):
+        start = time.perf_counter()
+        # Query methods print every row; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows += len(getattr(queries, method)(*args))
+        latencies.append((time.perf_counter() - start) * 1000)
+    total_bytes = client.bytes_received - received
+    return {
+        'rows': rows // iterations,
+        'bytes': total_bytes // iterations,
+        'bytes_per_row': round(total_bytes / rows, 1) if rows else None,
+        'median_ms': round(statistics.median(latencies), 2),
+    }
+
+
+def run_benchmark(url="http://localhost:8182", iterations=20):
+    """Measure payload size and latency of the workload under each configuration"""
+    results = {}
+    for label, compression, projection in CONFIGURATIONS:
+        queries = HttpNeptuneQueries(url, compression=compression, projection=projection)
+        results[label] = {
+            name: measure(queries, method, args, iterations)
+            for name, method, args in WORKLOAD
+        }
+    return results
+
+
+def print_report(results):
+    """Print bytes per row and median latency for each configuration"""
+    baseline = results[CONFIGURATIONS[0][0]]
+    print(f"{'query':<22} {'config':<16} {'rows':>5} {'bytes/row':>10} {'vs base':>8} {'p50 ms':>8}")
+    for name, _, _ in WORKLOAD:
+        for label, _, _ in CONFIGURATIONS:
+            stats = results[label][name]
+            base = baseline[name]['bytes_per_row']
+            ratio = f"{stats['bytes_per_row'] / base:.0%}" if stats['bytes_per_row'] and base else '-'
+            print(f"{name:<22} {label:<16} {stats['rows']:>5} "
+                  f"{stats['bytes_per_row'] or '-':>10} {ratio:>8} {stats['median_ms']:>8}")
+
+
+def main(argv=None):
+    from dotenv import load_dotenv
+    # docker-compose reads GREMLIN_PROFILE from .env, so the label must come from there too
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Measure response bytes per row for the HTTP client")
+    parser.add_argument('--url', default="http://localhost:8182")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--profile', default=os.getenv('GREMLIN_PROFILE', 'air-routes'),
+                        help="Server tuning profile the stack was started with")
+    parser.add_argument('--output', help="Write raw results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    print(f"Server profile: {args.profile}")
+    results = run_benchmark(args.url, args.iterations)
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'profile': args.profile, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import sys
+
+# Only the standard library is imported at module level. Each command imports
+# what it needs, so `shell` never loads gremlinpython and `--help` loads nothing.
+
+DEFAULT_URL = "http://localhost:8182"
+
+# query name -> (query method, argument converters)
+QUERIES = {
+    'users': ('get_all_users', ()),
+    'products': ('get_all_products', ()),
+    'purchases': ('get_user_purchases', (str,)),
+    'friends': ('get_user_friends', (str,)),
+    'popular': ('get_popular_products', (int,)),
+    'recommendations': ('get_recommendations_for_user', (str,)),
+    'friends-purchases': ('get_friends_purchases', (str,)),
+    'category': ('get_products_by_category', (str,)),
+    'high-rated': ('get_high_rated_products', (float,)),
+    'network': ('get_user_network_size', (str,)),
+    'analytics': ('get_purchase_analytics', ()),
+}
+
+
+def convert_params(name, values):
+    """Convert string arguments for a named query with its QUERIES converters.
+    Optional trailing arguments (popular's limit, high-rated's min rating) can
+    be left out and fall back to the query method defaults."""
+    converters = QUERIES[name][1]
+    if len(values) > len(converters):
+        raise ValueError(f"{name} takes at most {len(converters)} argument(s)")
+    params = []
+    for convert, value in zip(converters, values):
+        try:
+            params.append(convert(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"{name}: invalid argument {value!r}")
+    return params
+
+
+def ensure_loaded(url, force=False):
+    """Load the sample data if needed, exiting with an error if the server is unreachable"""
+    from sample_data import ensure_sample_data
+    try:
+        ensure_sample_data(url, force=force)
+    except Exception as e:
+        sys.exit(f"Failed to connect to Gremlin server: {e}")
+
+
+def cmd_load(args):
+    ensure_loaded(args.url, force=args.force)
+
+
+def cmd_query(args):
+    method = QUERIES[args.name][0]
+    try:
+        params = convert_params(args.name, args.params)
+    except ValueError as e:
+        sys.exit(str(e))
+
+    if args.driver == 'websocket':
+        from queries import NeptuneQueries
+        queries = NeptuneQueries()
+        try:
+            getattr(queries, method)(*params)
+        finally:
+            queries.close_connection()
+    else:
+        from sample_data import HttpNeptuneQueries
+        queries = HttpNeptuneQueries(args.url, compression=args.compression, projection=args.projection)
+        getattr(queries, method)(*params)
+
+
+def cmd_bench(args):
+    import bench
+    bench_args = args.bench_args[1:] if args.bench_args[:1] == ['--'] else args.bench_args
+    bench.main(['--url', args.url] + bench_args)
+
+
+def cmd_replay(args):
+    import replay
+    replay_args = args.replay_args[1:] if args.replay_args[:1] == ['--'] else args.replay_args
+    replay.main(['--url', args.url] + replay_args)
+
+
+def cmd_shell(args):
+    from demo import interactive_mode
+    if not args.skip_check:
+        ensure_loaded(args.url)
+    interactive_mode(args.url)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Neptune playground command line")
+    parser.add_argument('--url', default=DEFAULT_URL, help="HTTP Gremlin endpoint")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    load = subparsers.add_parser('load', help="Load the sample data if it is not already present")
+    load.add_argument('--force', action='store_true', help="Reload even if the data is present")
+    load.set_defaults(func=cmd_load)
+
+    query = subparsers.add_parser('query', help="Run a single named query")
+    query.add_argument('name', choices=list(QUERIES))
+    query.add_argument('params', nargs='*')
+    query.add_argument('--driver', choices=['http', 'websocket'], default='http',
+                       help="HTTP client, or gremlinpython over WebSocket (NeptuneConfig settings)")
+    query.add_argument('--compression', choices=['identity', 'gzip', 'deflate'])
+    query.add_argument('--projection', action='store_true', help="Return declared fields only")
+    query.set_defaults(func=cmd_query)
+
+    bench = subparsers.add_parser('bench', help="Run the payload benchmark (arguments go to bench.py)")
+    bench.add_argument('bench_args', nargs=argparse.REMAINDER)
+    bench.set_defaults(func=cmd_bench)
+
+    replay = subparsers.add_parser('replay', help="Replay recorded query traffic (arguments go to replay.py)")
+    replay.add_argument('replay_args', nargs=argparse.REMAINDER)
+    replay.set_defaults(func=cmd_replay)
+
+    shell = subparsers.add_parser('shell', help="Interactive query prompt")
+    shell.add_argument('--skip-check', action='store_true',
+                       help="Skip the sample data fingerprint check")
+    shell.set_defaults(func=cmd_shell)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,13 @@
 import os
-from dotenv import load_dotenv
-from gremlin_python.driver import client
-from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
-from gremlin_python.driver.aiohttp.transport import AiohttpTransport
-from gremlin_python.process.anonymous_traversal import traversal
 
-load_dotenv()
+# gremlinpython and dotenv are imported where they are used: they dominate
+# import time and the HTTP-only entry points never need them.
 
 class NeptuneConfig:
     def __init__(self):
+        from dotenv import load_dotenv
+        load_dotenv()
+        
         self.endpoint = os.getenv('NEPTUNE_ENDPOINT')
         self.port = os.getenv('NEPTUNE_PORT', '8182')
         self.region = os.getenv('AWS_REGION', 'us-east-1')
@@ -16,6 +15,10 @@ class NeptuneConfig:
         
     def get_connection(self, use_local=True):
         """Get Gremlin connection - use local by default for demo"""
+        from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
+        from gremlin_python.driver.aiohttp.transport import AiohttpTransport
+        from gremlin_python.process.anonymous_traversal import traversal
+        
         if use_local:
             connection_string = self.local_endpoint
         else:
@@ -44,6 +47,9 @@ class NeptuneConfig:
             
     def get_client(self, use_local=True):
         """Get Gremlin client for raw queries"""
+        from gremlin_python.driver import client
+        from gremlin_python.driver.aiohttp.transport import AiohttpTransport
+        
         if use_local:
             connection_string = self.local_endpoint + '/gremlin'
         else:
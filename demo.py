@@ -1,8 +1,7 @@
-from sample_data import populate_sample_data, HttpNeptuneQueries
-
-
-def interactive_mode():
+def interactive_mode(url="http://localhost:8182"):
     """Interactive mode for running custom queries"""
+    from sample_data import HttpNeptuneQueries, query_server
+    
     print("Neptune Interactive Demo")
     print("=" * 30)
     print("Available commands:")
@@ -15,11 +14,11 @@ def interactive_mode():
     print("7. demo - Run full demo")
     print("8. quit - Exit")
     
-    queries = HttpNeptuneQueries("http://localhost:8182")
+    queries = HttpNeptuneQueries(url)
     
     # Test connection
     try:
-        queries.client.get_vertex_count()
+        query_server(url, "g.V().count()")
         print("Connected to HTTP Gremlin server successfully!")
     except Exception as e:
         print(f"Failed to connect to HTTP Gremlin server: {e}")
@@ -62,5 +61,5 @@ def interactive_mode():
         print("\nGoodbye!")
 
 if __name__ == "__main__":
-    populate_sample_data()
-    interactive_mode()
\ No newline at end of file
+    from cli import main
+    main(['shell'])
\ No newline at end of file
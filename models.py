@@ -1,7 +1,18 @@
+import threading
+import time
+import uuid
+from gremlin_python.driver.protocol import GremlinServerError
 from gremlin_python.process.graph_traversal import __
-from gremlin_python.process.traversal import T
+from gremlin_python.process.traversal import T, Cardinality
 from datetime import datetime
 
+# Server errors worth retrying: conflicts, throttling and failover on Neptune
+TRANSIENT_SERVER_ERRORS = (
+    'ConcurrentModificationException',
+    'ReadOnlyViolationException',
+    'ThrottlingException',
+)
+
 class GraphModel:
     def __init__(self, g):
         self.g = g
@@ -54,4 +65,231 @@ class GraphModel:
                 .addE('recommended').from_('u').to('p')
                 .property('score', score)
                 .property('createdAt', datetime.now().isoformat())
-                .next())
\ No newline at end of file
+                .next())
+    
+    def write_session(self, batch_size=100, max_delay=1.0, use_tx=False, max_retries=3):
+        """Open a buffered write session, see GraphWriteSession"""
+        return GraphWriteSession(self.g, batch_size=batch_size, max_delay=max_delay,
+                                 use_tx=use_tx, max_retries=max_retries)
+
+
+class GraphWriteSession:
+    """Buffers GraphModel mutations and writes them in batches.
+    
+    A batch is sent as a single traversal, so it costs one round trip and, on
+    Neptune, one transaction. With use_tx=True the batch is also wrapped in
+    g.tx() for transactional Gremlin Server graphs. Mutations are applied in
+    the order they were added, so an edge can follow the vertices it connects
+    in the same batch.
+    
+    Writes are upserts, with keys and timestamps fixed when the mutation is
+    buffered, so a failed batch can be retried without duplicating anything.
+    Vertices are keyed on userId/productId. Purchases can repeat, so each one
+    is keyed on a purchaseId; friendships and recommendations are keyed on
+    their endpoints.
+    
+    A batch is flushed once it holds batch_size mutations, or max_delay
+    seconds after its first mutation was buffered (from a timer thread).
+    An error raised by a timed flush is re-raised by the next call into the
+    session.
+    
+    An edge whose endpoint does not exist fails its batch with a fail() step
+    error, like GraphModel's create_* methods raise, instead of being dropped.
+    
+    Used as a context manager, the buffer is flushed on exit; if the block
+    raised, buffered writes are discarded instead.
+    """
+    
+    def __init__(self, g, batch_size=100, max_delay=1.0, use_tx=False, max_retries=3,
+                 retry_backoff=0.5):
+        self.g = g
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.use_tx = use_tx
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.pending = []
+        self.timer = None
+        self.timer_error = None
+        # Serialises buffer access and writes between callers and the timer
+        self.lock = threading.RLock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            with self.lock:
+                self._cancel_timer()
+                self.pending = []
+        return False
+    
+    def create_user(self, user_id, name, email, age):
+        """Buffer a user vertex upsert"""
+        self._add(self._upsert_vertex('user', 'userId', user_id, {
+            'name': name,
+            'email': email,
+            'age': age
+        }, created={'createdAt': datetime.now().isoformat()}))
+    
+    def create_product(self, product_id, name, category, price):
+        """Buffer a product vertex upsert"""
+        self._add(self._upsert_vertex('product', 'productId', product_id, {
+            'name': name,
+            'category': category,
+            'price': price
+        }, created={'createdAt': datetime.now().isoformat()}))
+    
+    def create_purchase(self, user_id, product_id, quantity=1, rating=None, purchase_id=None):
+        """Buffer a purchase edge upsert, keyed on purchase_id (generated if not given)"""
+        purchase_id = purchase_id or str(uuid.uuid4())
+        properties = {'quantity': quantity}
+        if rating:
+            properties['rating'] = rating
+        self._add(self._upsert_edge('purchased', ('user', 'userId', user_id),
+                                    ('product', 'productId', product_id), properties,
+                                    created={'purchaseDate': datetime.now().isoformat()},
+                                    key=('purchaseId', purchase_id)))
+    
+    def create_friendship(self, user_id1, user_id2):
+        """Buffer a friendship edge upsert"""
+        self._add(self._upsert_edge('friends_with', ('user', 'userId', user_id1),
+                                    ('user', 'userId', user_id2), {},
+                                    created={'createdAt': datetime.now().isoformat()}))
+    
+    def create_recommendation(self, user_id, product_id, score):
+        """Buffer a recommendation edge upsert"""
+        self._add(self._upsert_edge('recommended', ('user', 'userId', user_id),
+                                    ('product', 'productId', product_id),
+                                    {'score': score},
+                                    created={'createdAt': datetime.now().isoformat()}))
+    
+    def flush(self):
+        """Write all buffered mutations, retrying the batch on failure"""
+        with self.lock:
+            self._raise_timer_error()
+            self._flush()
+    
+    def _flush(self):
+        self._cancel_timer()
+        if not self.pending:
+            return
+        batch = self.pending
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._write(batch)
+                break
+            except Exception as e:
+                if attempt == self.max_retries or not self._is_transient(e):
+                    # Keep the batch buffered so the caller can flush again
+                    raise
+                print(f"Write batch of {len(batch)} failed ({e}), retrying...")
+                time.sleep(self.retry_backoff * 2 ** attempt)
+        self.pending = []
+    
+    @staticmethod
+    def _is_transient(error):
+        """Connection failures and timeouts, or a server error Neptune marks as retryable"""
+        if isinstance(error, OSError):
+            # Includes ConnectionError and TimeoutError
+            return True
+        if isinstance(error, GremlinServerError):
+            return any(name in str(error) for name in TRANSIENT_SERVER_ERRORS)
+        return False
+    
+    def _add(self, mutation):
+        with self.lock:
+            self._raise_timer_error()
+            self.pending.append(mutation)
+            if len(self.pending) >= self.batch_size:
+                self._flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.max_delay, self._flush_on_timer)
+                self.timer.daemon = True
+                self.timer.start()
+    
+    def _flush_on_timer(self):
+        with self.lock:
+            if self.timer is not threading.current_thread():
+                # Cancelled or superseded while waiting for the lock
+                return
+            self.timer = None
+            try:
+                self._flush()
+            except Exception as e:
+                self.timer_error = e
+    
+    def _cancel_timer(self):
+        if self.timer is not None and self.timer is not threading.current_thread():
+            self.timer.cancel()
+        self.timer = None
+    
+    def _raise_timer_error(self):
+        if self.timer_error is not None:
+            error, self.timer_error = self.timer_error, None
+            raise error
+    
+    def _write(self, batch):
+        """Send a batch as one traversal of chained sideEffect() mutations"""
+        if not self.use_tx:
+            self._batch_traversal(self.g, batch).iterate()
+            return
+        tx = self.g.tx()
+        gtx = tx.begin()
+        try:
+            self._batch_traversal(gtx, batch).iterate()
+            tx.commit()
+        except Exception:
+            if tx.is_open():
+                tx.rollback()
+            raise
+    
+    @staticmethod
+    def _batch_traversal(g, batch):
+        traversal = g.inject(0)
+        for mutation in batch:
+            traversal = traversal.sideEffect(mutation)
+        return traversal
+    
+    @staticmethod
+    def _upsert_vertex(label, key, value, properties, created=None):
+        """Vertex upsert: the key and created properties are only set when the
+        vertex is added, properties are applied to new and existing vertices"""
+        added = __.addV(label).property(key, value)
+        for name, prop_value in (created or {}).items():
+            added = added.property(name, prop_value)
+        vertex = __.V().has(label, key, value).fold().coalesce(__.unfold(), added)
+        for name, prop_value in properties.items():
+            vertex = vertex.property(Cardinality.single, name, prop_value)
+        return vertex
+    
+    @staticmethod
+    def _require_vertex(traversal, label, key, value):
+        """Step to a vertex, failing the whole batch if it does not exist. No
+        fold() here: a barrier would drop the path labels the edge step needs."""
+        return traversal.coalesce(__.V().has(label, key, value),
+                                  __.fail(f"Missing {label} {key}={value}"))
+    
+    @staticmethod
+    def _upsert_edge(label, out_vertex, in_vertex, properties, created=None, key=None):
+        """Edge upsert keyed on its endpoints, or on a key property for edges
+        that may repeat between the same vertices. As for vertices, created
+        properties are only set when the edge is added."""
+        out_label, out_key, out_value = out_vertex
+        in_label, in_key, in_value = in_vertex
+        existing = __.inE(label)
+        added = __.addE(label).from_('from')
+        if key:
+            existing = existing.has(*key)
+            added = added.property(*key)
+        for name, prop_value in (created or {}).items():
+            added = added.property(name, prop_value)
+        require = GraphWriteSession._require_vertex
+        edge = (require(require(__, out_label, out_key, out_value).as_('from'),
+                        in_label, in_key, in_value)
+                .coalesce(existing.where(__.outV().as_('from')), added))
+        for name, prop_value in properties.items():
+            edge = edge.property(name, prop_value)
+        return edge
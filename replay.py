@@ -0,0 +1,274 @@
+import argparse
+import contextlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from cli import QUERIES, convert_params
+
+PERCENTILES = (50, 90, 99, 99.9)
+QUERY_METHODS = {method for method, _ in QUERIES.values()}
+
+
+def parse_timestamp(value):
+    """Epoch seconds or an ISO 8601 string, as epoch seconds"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp()
+
+
+def load_records(path):
+    """Read JSONL records of {"query": ..., "params": [...] or {...}, "timestamp": ...},
+    in timestamp order when every record has one"""
+    records = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            name = record['query']
+            # Accept both CLI query names and the query method names
+            method = QUERIES[name][0] if name in QUERIES else name
+            if method not in QUERY_METHODS:
+                raise ValueError(f"Unknown query {name!r} on line {line_number}")
+            params = record.get('params', [])
+            if name in QUERIES and isinstance(params, list):
+                # CLI names take CLI-style arguments: "3" is a limit of 3, as in `cli.py query`
+                try:
+                    params = convert_params(name, params)
+                except ValueError as e:
+                    raise ValueError(f"Bad params for {name!r} on line {line_number}: {e}")
+            records.append({
+                'query': name,
+                'method': method,
+                'params': params,
+                'timestamp': parse_timestamp(record['timestamp']) if 'timestamp' in record else None,
+            })
+    timestamps = [record['timestamp'] for record in records]
+    if None not in timestamps and timestamps != sorted(timestamps):
+        print(f"Warning: {path} is not in timestamp order, sorting it before replay", file=sys.stderr)
+        records.sort(key=lambda record: record['timestamp'])
+    return records
+
+
+def schedule(records, speed=1.0, qps=None):
+    """Intended start offsets in seconds: fixed-rate when qps is set, else recorded pacing"""
+    if qps:
+        return [i / qps for i in range(len(records))]
+    timestamps = [record['timestamp'] for record in records]
+    if None in timestamps:
+        raise ValueError("Every record needs a timestamp to replay at recorded pacing (or use --qps)")
+    if timestamps != sorted(timestamps):
+        # A request scheduled in the past would have its wait counted as latency
+        raise ValueError("Records must be in timestamp order to replay at recorded pacing")
+    first = timestamps[0] if timestamps else 0
+    return [(timestamp - first) / speed for timestamp in timestamps]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def histogram(values):
+    """Count latencies (ms) into power-of-two buckets"""
+    buckets = {}
+    for value in values:
+        bound = 1
+        while bound < value:
+            bound *= 2
+        buckets[bound] = buckets.get(bound, 0) + 1
+    return dict(sorted(buckets.items()))
+
+
+class Replayer:
+    """Replays recorded queries open-loop through a worker pool.
+
+    Requests are dispatched at their intended times whether or not earlier
+    ones have finished. Latency is measured both from the moment a worker
+    picked the request up (service time) and from its intended start time;
+    the latter includes time spent waiting for a free worker, which corrects
+    for coordinated omission when the target falls behind.
+    """
+
+    def __init__(self, url="http://localhost:8182", driver='http', workers=16):
+        self.url = url
+        self.driver = driver
+        self.workers = workers
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def _make_queries(self):
+        if self.driver == 'websocket':
+            from queries import NeptuneQueries
+            return NeptuneQueries()
+        from sample_data import HttpNeptuneQueries
+        queries = HttpNeptuneQueries(self.url, raise_errors=True)
+        # The session (and the requests import) is otherwise created on first query
+        queries.client.session
+        return queries
+
+    def _queries(self):
+        """One query object per worker thread; neither client is thread-safe"""
+        if not hasattr(self.local, 'queries'):
+            queries = self._make_queries()
+            with self.lock:
+                self.connections.append(queries)
+            self.local.queries = queries
+        return self.local.queries
+
+    def _warm_up(self, barrier):
+        """Build this worker's client, then hold the thread until every worker has one"""
+        try:
+            self._queries()
+        finally:
+            barrier.wait()
+
+    def _run_one(self, record, intended_start):
+        # Normally built during warm-up; kept out of the measured time either way
+        queries = self._queries()
+        started = time.perf_counter()
+        error = None
+        try:
+            method = getattr(queries, record['method'])
+            params = record['params']
+            if isinstance(params, dict):
+                method(**params)
+            else:
+                method(*params)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = time.perf_counter()
+        return {
+            'query': record['query'],
+            'service_ms': (finished - started) * 1000,
+            'corrected_ms': (finished - intended_start) * 1000,
+            'error': error,
+        }
+
+    def run(self, records, offsets):
+        """Replay records at the given start offsets and return per-request samples"""
+        futures = []
+        # Query methods print every row; discard it rather than buffer a whole replay
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), \
+                ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Create every worker thread and its client before the clock starts,
+            # so imports and connection setup don't land in the first requests
+            barrier = threading.Barrier(self.workers)
+            for warm_up in [pool.submit(self._warm_up, barrier) for _ in range(self.workers)]:
+                warm_up.result()
+            start = time.perf_counter()
+            for record, offset in zip(records, offsets):
+                intended_start = start + offset
+                delay = intended_start - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(self._run_one, record, intended_start))
+            samples = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+        self.close()
+        return samples, elapsed
+
+    def close(self):
+        for queries in self.connections:
+            if hasattr(queries, 'close_connection'):
+                queries.close_connection()
+        self.connections = []
+
+
+def summarize(samples, elapsed):
+    """Latency percentiles and histogram of successful requests, and error rates.
+    Failures such as refused connections return fast, so they are kept out of
+    the latency figures."""
+    succeeded = [s for s in samples if not s['error']]
+    service = sorted(s['service_ms'] for s in succeeded)
+    corrected = sorted(s['corrected_ms'] for s in succeeded)
+    errors = {}
+    per_query = {}
+    for sample in samples:
+        stats = per_query.setdefault(sample['query'], {'requests': 0, 'errors': 0})
+        stats['requests'] += 1
+        if sample['error']:
+            stats['errors'] += 1
+            errors[sample['error']] = errors.get(sample['error'], 0) + 1
+    error_count = sum(stats['errors'] for stats in per_query.values())
+    return {
+        'requests': len(samples),
+        'succeeded': len(succeeded),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_qps': round(len(samples) / elapsed, 1) if elapsed else None,
+        'error_rate': round(error_count / len(samples), 4) if samples else 0.0,
+        'service_ms': {f"p{p}": round(percentile(service, p), 2) for p in PERCENTILES},
+        'corrected_ms': {f"p{p}": round(percentile(corrected, p), 2) for p in PERCENTILES},
+        'max_ms': round(corrected[-1], 2) if corrected else 0.0,
+        'histogram_ms': histogram(corrected),
+        'per_query': per_query,
+        'errors': errors,
+    }
+
+
+def print_report(summary):
+    print(f"Requests: {summary['requests']} in {summary['elapsed_s']}s "
+          f"({summary['throughput_qps']} qps), error rate {summary['error_rate']:.2%}")
+    print(f"\nLatency of {summary['succeeded']} successful requests:")
+    print(f"{'percentile':<12} {'service ms':>12} {'corrected ms':>14}")
+    for p in PERCENTILES:
+        key = f"p{p}"
+        print(f"{key:<12} {summary['service_ms'][key]:>12} {summary['corrected_ms'][key]:>14}")
+    print(f"{'max':<12} {'':>12} {summary['max_ms']:>14}")
+
+    print("\nCorrected latency histogram:")
+    total = summary['succeeded'] or 1
+    for bound, count in summary['histogram_ms'].items():
+        print(f"  <= {bound:>6} ms {count:>7}  {'#' * max(1, round(40 * count / total))}")
+
+    print(f"\n{'query':<28} {'requests':>9} {'errors':>7}")
+    for name, stats in summary['per_query'].items():
+        print(f"{name:<28} {stats['requests']:>9} {stats['errors']:>7}")
+    for error, count in summary['errors'].items():
+        print(f"  {count} x {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded query traffic against the graph")
+    parser.add_argument('log', help="JSONL file of query records")
+    parser.add_argument('--url', default="http://localhost:8182")
+    parser.add_argument('--driver', choices=['http', 'websocket'], default='http')
+    parser.add_argument('--workers', type=int, default=16)
+    pacing = parser.add_mutually_exclusive_group()
+    pacing.add_argument('--speed', type=float, default=1.0,
+                        help="Multiplier on the recorded pacing (2 = twice as fast)")
+    pacing.add_argument('--qps', type=float, help="Ignore timestamps and dispatch at a fixed rate")
+    parser.add_argument('--output', help="Write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+    if args.speed <= 0 or (args.qps is not None and args.qps <= 0):
+        parser.error("--speed and --qps must be positive")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    records = load_records(args.log)
+    offsets = schedule(records, speed=args.speed, qps=args.qps)
+    mode = f"{args.qps} qps open-loop" if args.qps else f"recorded pacing x{args.speed}"
+    print(f"Replaying {len(records)} requests ({mode}) with {args.workers} workers...")
+
+    samples, elapsed = Replayer(args.url, args.driver, args.workers).run(records, offsets)
+    summary = summarize(samples, elapsed)
+    summary['mode'] = mode
+    print_report(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSummary written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,45 @@
-import requests
+import gzip
 import json
+import zlib
 from datetime import datetime
 
+# Plain JSON results, whichever serializer the server lists first
+GRAPHSON_UNTYPED = 'application/vnd.gremlin-v3.0+json;types=false'
+
+# Vertex and edge counts per label in a single round trip
+FINGERPRINT_QUERY = """
+g.inject(1)
+ .project('vertices', 'edges')
+ .by(__.V().groupCount().by(T.label))
+ .by(__.E().groupCount().by(T.label))
+"""
+
+# Fields returned by the "all users"/"all products" queries in projection mode
+USER_FIELDS = ('userId', 'name', 'email', 'age')
+PRODUCT_FIELDS = ('productId', 'name', 'category', 'price')
+
 class HttpGremlinClient:
-    def __init__(self, url):
+    def __init__(self, url, compression=None, raise_errors=False):
+        """compression: Accept-Encoding to send ('gzip', 'deflate' or 'identity');
+        None accepts either gzip or deflate. raise_errors re-raises failed
+        queries instead of returning None."""
+        if compression not in (None, 'identity', 'gzip', 'deflate'):
+            raise ValueError(f"Unsupported compression: {compression}")
         self.url = url.rstrip('/')
-        self.session = requests.Session()
+        self._session = None
+        self.compression = compression
+        self.raise_errors = raise_errors
+        # Response bytes on the wire, before any decompression
+        self.bytes_received = 0
+    
+    @property
+    def session(self):
+        """HTTP session, created on first use: importing requests is the bulk
+        of the CLI startup time"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
     
     def execute(self, gremlin_query):
         """Execute a raw Gremlin query via HTTP"""
@@ -14,22 +48,50 @@ class HttpGremlinClient:
         }
         
         headers = {
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept': GRAPHSON_UNTYPED
         }
+        # Always explicit: urllib3's default list can include br/zstd, which _decode can't read
+        headers['Accept-Encoding'] = self.compression or 'gzip, deflate'
+        
+        body = json.dumps(payload).encode('utf-8')
         
         try:
             response = self.session.post(
                 f"{self.url}/gremlin",
-                json=payload,
+                data=body,
                 headers=headers,
-                timeout=30
+                timeout=30,
+                stream=True
             )
-            response.raise_for_status()
-            return response.json()
+            try:
+                response.raise_for_status()
+                raw = response.raw.read(decode_content=False)
+            finally:
+                response.close()
+            self.bytes_received += len(raw)
+            return json.loads(self._decode(raw, response.headers.get('Content-Encoding')))
         except Exception as e:
+            if self.raise_errors:
+                raise
             print(f"Query execution failed: {e}")
             return None
     
+    @staticmethod
+    def _decode(raw, encoding):
+        """Decompress a response body according to its Content-Encoding"""
+        if encoding == 'gzip':
+            return gzip.decompress(raw)
+        if encoding == 'deflate':
+            try:
+                return zlib.decompress(raw)
+            except zlib.error:
+                # Some servers send raw deflate streams without the zlib header
+                return zlib.decompress(raw, -zlib.MAX_WBITS)
+        if encoding in (None, '', 'identity'):
+            return raw
+        raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+    
     def clear_graph(self):
         """Clear all vertices and edges"""
         print("Clearing existing data...")
@@ -100,15 +162,30 @@ class HttpGremlinClient:
         if result and 'result' in result and 'data' in result['result']:
             return result['result']['data'][0]
         return 0
+    
 
 class HttpNeptuneQueries:
-    def __init__(self, url="http://localhost:8182"):
-        self.client = HttpGremlinClient(url)
+    def __init__(self, url="http://localhost:8182", compression=None, projection=False,
+                 raise_errors=False):
+        """projection: unfold single-valued property lists to plain values, and
+        return only the declared fields from the "all users/products" queries.
+        Every valueMap query method also takes fields= to narrow its result."""
+        self.client = HttpGremlinClient(url, compression=compression, raise_errors=raise_errors)
+        self.projection = projection
+    
+    def _value_map(self, *fields):
+        """Build a valueMap() step for the given fields"""
+        step = f"valueMap({', '.join(repr(field) for field in fields)})"
+        if self.projection:
+            step += ".by(unfold())"
+        return step
         
-    def get_all_users(self):
+    def get_all_users(self, fields=None):
         """Get all users in the graph"""
         print("=== All Users ===")
-        result = self.client.execute("g.V().hasLabel('user').valueMap()")
+        if fields is None and self.projection:
+            fields = USER_FIELDS
+        result = self.client.execute(f"g.V().hasLabel('user').{self._value_map(*(fields or ()))}")
         if result and 'result' in result and 'data' in result['result']:
             users = result['result']['data']
             for user in users:
@@ -116,10 +193,12 @@ class HttpNeptuneQueries:
             return users
         return []
     
-    def get_all_products(self):
+    def get_all_products(self, fields=None):
         """Get all products in the graph"""
         print("=== All Products ===")
-        result = self.client.execute("g.V().hasLabel('product').valueMap()")
+        if fields is None and self.projection:
+            fields = PRODUCT_FIELDS
+        result = self.client.execute(f"g.V().hasLabel('product').{self._value_map(*(fields or ()))}")
         if result and 'result' in result and 'data' in result['result']:
             products = result['result']['data']
             for product in products:
@@ -127,13 +206,13 @@ class HttpNeptuneQueries:
             return products
         return []
     
-    def get_user_purchases(self, user_id):
+    def get_user_purchases(self, user_id, fields=None):
         """Get all products purchased by a specific user"""
         print(f"=== Purchases by User {user_id} ===")
         query = f"""
         g.V().has('user', 'userId', '{user_id}')
          .out('purchased')
-         .valueMap('productId', 'name', 'category', 'price')
+         .{self._value_map(*(fields or ('productId', 'name', 'category', 'price')))}
         """
         result = self.client.execute(query)
         if result and 'result' in result and 'data' in result['result']:
@@ -143,13 +222,13 @@ class HttpNeptuneQueries:
             return purchases
         return []
     
-    def get_user_friends(self, user_id):
+    def get_user_friends(self, user_id, fields=None):
         """Get all friends of a specific user"""
         print(f"=== Friends of User {user_id} ===")
         query = f"""
         g.V().has('user', 'userId', '{user_id}')
          .both('friends_with')
-         .valueMap('userId', 'name', 'email')
+         .{self._value_map(*(fields or ('userId', 'name', 'email')))}
         """
         result = self.client.execute(query)
         if result and 'result' in result and 'data' in result['result']:
@@ -159,13 +238,13 @@ class HttpNeptuneQueries:
             return friends
         return []
     
-    def get_popular_products(self, limit=5):
+    def get_popular_products(self, limit=5, fields=None):
         """Get most purchased products"""
         print(f"=== Top {limit} Popular Products ===")
         query = f"""
         g.V().hasLabel('product')
          .project('product', 'purchaseCount')
-         .by(valueMap('productId', 'name', 'category'))
+         .by({self._value_map(*(fields or ('productId', 'name', 'category')))})
          .by(__.in('purchased').count())
          .order().by(select('purchaseCount'), desc)
          .limit({limit})
@@ -178,13 +257,13 @@ class HttpNeptuneQueries:
             return popular
         return []
     
-    def get_recommendations_for_user(self, user_id):
+    def get_recommendations_for_user(self, user_id, fields=None):
         """Get product recommendations for a user"""
         print(f"=== Recommendations for User {user_id} ===")
         query = f"""
         g.V().has('user', 'userId', '{user_id}')
          .out('recommended')
-         .valueMap('productId', 'name', 'category', 'price')
+         .{self._value_map(*(fields or ('productId', 'name', 'category', 'price')))}
         """
         result = self.client.execute(query)
         if result and 'result' in result and 'data' in result['result']:
@@ -194,7 +273,7 @@ class HttpNeptuneQueries:
             return recommendations
         return []
     
-    def get_friends_purchases(self, user_id):
+    def get_friends_purchases(self, user_id, fields=None):
         """Get products purchased by friends of a user"""
         print(f"=== What Friends of User {user_id} Bought ===")
         query = f"""
@@ -202,7 +281,7 @@ class HttpNeptuneQueries:
          .both('friends_with')
          .out('purchased')
          .dedup()
-         .valueMap('productId', 'name', 'category', 'price')
+         .{self._value_map(*(fields or ('productId', 'name', 'category', 'price')))}
         """
         result = self.client.execute(query)
         if result and 'result' in result and 'data' in result['result']:
@@ -212,13 +291,13 @@ class HttpNeptuneQueries:
             return friend_purchases
         return []
     
-    def get_products_by_category(self, category):
+    def get_products_by_category(self, category, fields=None):
         """Get all products in a specific category"""
         print(f"=== Products in {category} Category ===")
         query = f"""
         g.V().hasLabel('product')
          .has('category', '{category}')
-         .valueMap('productId', 'name', 'price')
+         .{self._value_map(*(fields or ('productId', 'name', 'price')))}
         """
         result = self.client.execute(query)
         if result and 'result' in result and 'data' in result['result']:
@@ -228,7 +307,7 @@ class HttpNeptuneQueries:
             return products
         return []
     
-    def get_high_rated_products(self, min_rating=4):
+    def get_high_rated_products(self, min_rating=4, fields=None):
         """Get products with high ratings"""
         print(f"=== Products with Rating >= {min_rating} ===")
         query = f"""
@@ -236,7 +315,7 @@ class HttpNeptuneQueries:
          .has('rating', gte({min_rating}))
          .inV()
          .dedup()
-         .valueMap('productId', 'name', 'category', 'price')
+         .{self._value_map(*(fields or ('productId', 'name', 'category', 'price')))}
         """
         result = self.client.execute(query)
         if result and 'result' in result and 'data' in result['result']:
@@ -321,10 +400,109 @@ class HttpNeptuneQueries:
             'most_active_user': most_active
         }
 
-def populate_sample_data():
+SAMPLE_USERS = [
+    ('user1', 'Alice Johnson', 'alice@email.com', 28),
+    ('user2', 'Bob Smith', 'bob@email.com', 35),
+    ('user3', 'Carol Davis', 'carol@email.com', 42),
+    ('user4', 'David Wilson', 'david@email.com', 29),
+    ('user5', 'Eve Brown', 'eve@email.com', 33)
+]
+
+SAMPLE_PRODUCTS = [
+    ('prod1', 'Laptop', 'Electronics', 999.99),
+    ('prod2', 'Coffee Maker', 'Appliances', 79.99),
+    ('prod3', 'Python Book', 'Books', 29.99),
+    ('prod4', 'Wireless Headphones', 'Electronics', 149.99),
+    ('prod5', 'Desk Chair', 'Furniture', 199.99),
+    ('prod6', 'Smartphone', 'Electronics', 699.99)
+]
+
+SAMPLE_FRIENDSHIPS = [
+    ('user1', 'user2'),
+    ('user1', 'user3'),
+    ('user2', 'user4'),
+    ('user3', 'user4'),
+    ('user4', 'user5')
+]
+
+SAMPLE_PURCHASES = [
+    ('user1', 'prod1', 1, 5),
+    ('user1', 'prod3', 2, 4),
+    ('user2', 'prod2', 1, 5),
+    ('user2', 'prod4', 1, 4),
+    ('user3', 'prod1', 1, 5),
+    ('user3', 'prod5', 1, 3),
+    ('user4', 'prod6', 1, 5),
+    ('user4', 'prod3', 1, 4),
+    ('user5', 'prod2', 1, 4),
+    ('user5', 'prod4', 1, 5)
+]
+
+SAMPLE_RECOMMENDATIONS = [
+    ('user1', 'prod4', 0.85),
+    ('user2', 'prod3', 0.72),
+    ('user3', 'prod6', 0.91),
+    ('user4', 'prod2', 0.68),
+    ('user5', 'prod1', 0.89)
+]
+
+def sample_fingerprint():
+    """Vertex and edge counts per label expected once the sample data is loaded"""
+    return {
+        'vertices': {'user': len(SAMPLE_USERS), 'product': len(SAMPLE_PRODUCTS)},
+        'edges': {
+            'friends_with': len(SAMPLE_FRIENDSHIPS),
+            'purchased': len(SAMPLE_PURCHASES),
+            'recommended': len(SAMPLE_RECOMMENDATIONS)
+        }
+    }
+
+def query_server(url, gremlin_query, timeout=5):
+    """Run a query with the standard library HTTP client and return its data.
+    Used by the startup checks so the prompt does not wait on importing requests."""
+    import http.client
+    from urllib.parse import urlsplit
+    
+    parts = urlsplit(url)
+    if parts.scheme == 'https':
+        connection = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=timeout)
+    else:
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    try:
+        connection.request(
+            'POST',
+            parts.path.rstrip('/') + '/gremlin',
+            body=json.dumps({"gremlin": gremlin_query}),
+            headers={'Content-Type': 'application/json', 'Accept': GRAPHSON_UNTYPED}
+        )
+        response = connection.getresponse()
+        body = response.read()
+        if response.status >= 400:
+            raise RuntimeError(f"HTTP {response.status}: {body[:200].decode('utf-8', 'replace')}")
+        return json.loads(body)['result']['data']
+    finally:
+        connection.close()
+
+def get_fingerprint(url="http://localhost:8182"):
+    """Current vertex and edge counts per label, in sample_fingerprint() form"""
+    data = query_server(url, FINGERPRINT_QUERY)
+    return data[0] if data else None
+
+def ensure_sample_data(url="http://localhost:8182", force=False):
+    """Populate the sample data unless the graph already matches its fingerprint.
+    Returns True when the data was (re)loaded; raises if the server can't be reached."""
+    if not force:
+        fingerprint = get_fingerprint(url)
+        if fingerprint == sample_fingerprint():
+            print("Sample data already loaded, skipping reload")
+            return False
+    populate_sample_data(url)
+    return True
+
+def populate_sample_data(url="http://localhost:8182"):
     """Populate the graph with sample data"""
     # Connect to HTTP Gremlin server
-    client = HttpGremlinClient("http://localhost:8182")
+    client = HttpGremlinClient(url)
     
     # Test connection
     try:
@@ -338,73 +516,27 @@ def populate_sample_data():
     client.clear_graph()
     
     print("Creating sample users...")
-    users = [
-        ('user1', 'Alice Johnson', 'alice@email.com', 28),
-        ('user2', 'Bob Smith', 'bob@email.com', 35),
-        ('user3', 'Carol Davis', 'carol@email.com', 42),
-        ('user4', 'David Wilson', 'david@email.com', 29),
-        ('user5', 'Eve Brown', 'eve@email.com', 33)
-    ]
-    
-    for user_id, name, email, age in users:
+    for user_id, name, email, age in SAMPLE_USERS:
         client.create_user(user_id, name, email, age)
         print(f"Created user: {name}")
     
     print("\nCreating sample products...")
-    products = [
-        ('prod1', 'Laptop', 'Electronics', 999.99),
-        ('prod2', 'Coffee Maker', 'Appliances', 79.99),
-        ('prod3', 'Python Book', 'Books', 29.99),
-        ('prod4', 'Wireless Headphones', 'Electronics', 149.99),
-        ('prod5', 'Desk Chair', 'Furniture', 199.99),
-        ('prod6', 'Smartphone', 'Electronics', 699.99)
-    ]
-    
-    for product_id, name, category, price in products:
+    for product_id, name, category, price in SAMPLE_PRODUCTS:
         client.create_product(product_id, name, category, price)
         print(f"Created product: {name}")
     
     print("\nCreating friendships...")
-    friendships = [
-        ('user1', 'user2'),
-        ('user1', 'user3'),
-        ('user2', 'user4'),
-        ('user3', 'user4'),
-        ('user4', 'user5')
-    ]
-    
-    for user1, user2 in friendships:
+    for user1, user2 in SAMPLE_FRIENDSHIPS:
         client.create_friendship(user1, user2)
         print(f"Created friendship: {user1} <-> {user2}")
     
     print("\nCreating purchases...")
-    purchases = [
-        ('user1', 'prod1', 1, 5),
-        ('user1', 'prod3', 2, 4),
-        ('user2', 'prod2', 1, 5),
-        ('user2', 'prod4', 1, 4),
-        ('user3', 'prod1', 1, 5),
-        ('user3', 'prod5', 1, 3),
-        ('user4', 'prod6', 1, 5),
-        ('user4', 'prod3', 1, 4),
-        ('user5', 'prod2', 1, 4),
-        ('user5', 'prod4', 1, 5)
-    ]
-    
-    for user_id, product_id, quantity, rating in purchases:
+    for user_id, product_id, quantity, rating in SAMPLE_PURCHASES:
         client.create_purchase(user_id, product_id, quantity, rating)
         print(f"Created purchase: {user_id} bought {product_id}")
     
     print("\nCreating recommendations...")
-    recommendations = [
-        ('user1', 'prod4', 0.85),
-        ('user2', 'prod3', 0.72),
-        ('user3', 'prod6', 0.91),
-        ('user4', 'prod2', 0.68),
-        ('user5', 'prod1', 0.89)
-    ]
-    
-    for user_id, product_id, score in recommendations:
+    for user_id, product_id, score in SAMPLE_RECOMMENDATIONS:
         client.create_recommendation(user_id, product_id, score)
         print(f"Created recommendation: {user_id} -> {product_id} (score: {score})")
     
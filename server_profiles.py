@@ -0,0 +1,126 @@
+import argparse
+import os
+
+import yaml
+
+# Resolved against this file so the script and tests work from any directory
+BASE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'sample', 'conf', 'gremlin-server-air-routes.yaml')
+# Written next to the base config unless an output directory is given
+OUTPUT_TEMPLATE = 'gremlin-server-{profile}.yaml'
+
+# Server settings per workload. Pool sizes of 0 fall back to the Gremlin Server
+# default (number of available processors).
+PROFILES = {
+    'bulk-load': {
+        'description': 'Large mutation scripts, few concurrent clients',
+        'settings': {
+            'threadPoolWorker': 2,
+            'gremlinPool': 4,
+            'evaluationTimeout': 120000,
+            'maxContentLength': 10485760,
+            'maxChunkSize': 8192,
+            'resultIterationBatchSize': 64,
+            'writeBufferLowWaterMark': 32768,
+            'writeBufferHighWaterMark': 65536,
+        },
+        # Typed GraphSON first so returned ids and numbers keep their types
+        'untyped_serializer_first': False,
+    },
+    'oltp-reads': {
+        'description': 'Many short point reads and neighbourhood traversals',
+        'settings': {
+            'threadPoolWorker': 4,
+            'gremlinPool': 16,
+            'evaluationTimeout': 5000,
+            'maxContentLength': 65536,
+            'maxChunkSize': 8192,
+            'resultIterationBatchSize': 64,
+            'writeBufferLowWaterMark': 32768,
+            'writeBufferHighWaterMark': 65536,
+        },
+        'untyped_serializer_first': True,
+    },
+    'analytics': {
+        'description': 'Long-running scans returning large result sets',
+        'settings': {
+            'threadPoolWorker': 2,
+            'gremlinPool': 0,
+            'evaluationTimeout': 300000,
+            'maxContentLength': 1048576,
+            'maxChunkSize': 65536,
+            'resultIterationBatchSize': 512,
+            'writeBufferLowWaterMark': 262144,
+            'writeBufferHighWaterMark': 1048576,
+        },
+        'untyped_serializer_first': True,
+    },
+}
+
+
+def build_config(profile, base_config=BASE_CONFIG):
+    """Return the base server config with the profile's settings applied"""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile: {profile} (choose from {', '.join(PROFILES)})")
+    spec = PROFILES[profile]
+
+    with open(base_config) as f:
+        config = yaml.safe_load(f)
+
+    config.update(spec['settings'])
+
+    # Gremlin Server uses the first serializer when a client sends no Accept header
+    serializers = config.get('serializers', [])
+    untyped = [s for s in serializers if 'Untyped' in s['className']]
+    typed = [s for s in serializers if 'Untyped' not in s['className']]
+    config['serializers'] = untyped + typed if spec['untyped_serializer_first'] else typed + untyped
+    return config
+
+
+def leading_comments(path):
+    """The comment block (e.g. a license header) at the top of a YAML file"""
+    lines = []
+    with open(path) as f:
+        for line in f:
+            if not line.startswith('#') and line.strip():
+                break
+            lines.append(line)
+    return ''.join(lines).strip()
+
+
+def write_profile(profile, base_config=BASE_CONFIG, output_dir=None, output=None):
+    """Generate the server YAML for a profile and return the file path"""
+    if output is None:
+        output_dir = output_dir or os.path.dirname(os.path.abspath(base_config))
+        output = os.path.join(output_dir, OUTPUT_TEMPLATE.format(profile=profile))
+    config = build_config(profile, base_config)
+    header = (f"# Generated by server_profiles.py from {os.path.basename(base_config)}\n"
+              f"# Profile: {profile} - {PROFILES[profile]['description']}\n"
+              f"# Regenerate instead of editing by hand.\n\n")
+    base_comments = leading_comments(base_config)
+    with open(output, 'w') as f:
+        if base_comments:
+            f.write(base_comments + '\n\n')
+        f.write(header)
+        yaml.safe_dump(config, f, sort_keys=False, default_flow_style=False)
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Gremlin Server configs for workload profiles")
+    parser.add_argument('profiles', nargs='*',
+                        help=f"Profiles to generate: {', '.join(PROFILES)} (default: all)")
+    parser.add_argument('--base', default=BASE_CONFIG, help="Server config to start from")
+    parser.add_argument('--output-dir', help="Where to write the profiles (default: next to --base)")
+    args = parser.parse_args(argv)
+    unknown = [p for p in args.profiles if p not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profile(s): {', '.join(unknown)}")
+
+    for profile in args.profiles or PROFILES:
+        path = write_profile(profile, args.base, output_dir=args.output_dir)
+        print(f"Wrote {profile} profile to {path}")
+
+
+if __name__ == "__main__":
+    main()
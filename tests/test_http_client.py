@@ -0,0 +1,117 @@
+import gzip
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from sample_data import HttpGremlinClient, HttpNeptuneQueries
+
+BODY = json.dumps({'result': {'data': [{'name': ['Laptop'], 'price': [999.99]}] * 20}}).encode()
+
+
+def raw_deflate(data):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+ENCODERS = {
+    None: lambda data: data,
+    'gzip': gzip.compress,
+    'deflate': zlib.compress,
+    'raw-deflate': raw_deflate,
+}
+
+
+@pytest.fixture(scope='module')
+def stub():
+    """HTTP stub answering every query with BODY in the configured encoding"""
+    state = {}
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            state['headers'].append(dict(self.headers))
+            encoding = state['encoding']
+            body = ENCODERS.get(encoding, ENCODERS[None])(BODY)
+            state['sent'] = len(body)
+            self.send_response(200)
+            if encoding:
+                self.send_header('Content-Encoding', 'deflate' if encoding == 'raw-deflate' else encoding)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    httpd = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    state['url'] = f"http://127.0.0.1:{httpd.server_port}"
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def server(stub):
+    stub.update(encoding=None, headers=[])
+    return stub
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'deflate', 'raw-deflate'])
+def test_decodes_compressed_responses(server, encoding):
+    server['encoding'] = encoding
+    client = HttpGremlinClient(server['url'], compression='gzip' if encoding == 'gzip' else 'deflate')
+    assert client.execute("g.V()") == json.loads(BODY)
+    # Counted on the wire, before decompression
+    assert client.bytes_received == server['sent'] < len(BODY)
+
+
+def test_rejects_unknown_content_encoding(server):
+    server['encoding'] = 'br'
+    client = HttpGremlinClient(server['url'], raise_errors=True)
+    with pytest.raises(ValueError, match='Unsupported Content-Encoding: br'):
+        client.execute("g.V()")
+
+
+@pytest.mark.parametrize('compression, header', [
+    (None, 'gzip, deflate'),
+    ('identity', 'identity'),
+    ('gzip', 'gzip'),
+])
+def test_sends_explicit_accept_encoding(server, compression, header):
+    client = HttpGremlinClient(server['url'], compression=compression)
+    client.execute("g.V()")
+    assert server['headers'][-1]['Accept-Encoding'] == header
+    assert client.bytes_received == len(BODY)
+
+
+def test_rejects_unsupported_compression_option():
+    with pytest.raises(ValueError):
+        HttpGremlinClient("http://localhost:8182", compression='br')
+
+
+def recorded_query(projection, method, *args, **kwargs):
+    queries = HttpNeptuneQueries("http://localhost:8182", projection=projection)
+    sent = []
+    queries.client.execute = lambda query: sent.append(query) or None
+    getattr(queries, method)(*args, **kwargs)
+    return ' '.join(sent[0].split())
+
+
+def test_projection_unfolds_declared_fields():
+    assert recorded_query(True, 'get_all_users').endswith(
+        "valueMap('userId', 'name', 'email', 'age').by(unfold())")
+    assert recorded_query(False, 'get_all_users').endswith("valueMap()")
+    assert ".valueMap('productId', 'name', 'category', 'price').by(unfold())" in recorded_query(
+        True, 'get_user_purchases', 'user1')
+
+
+def test_query_methods_accept_fields():
+    assert ".valueMap('productId', 'price') " in recorded_query(
+        False, 'get_friends_purchases', 'user1', fields=('productId', 'price')) + ' '
+    assert ".by(valueMap('name').by(unfold()))" in recorded_query(
+        True, 'get_popular_products', fields=('name',))
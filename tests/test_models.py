@@ -0,0 +1,164 @@
+import re
+import time
+
+import pytest
+from gremlin_python.driver.protocol import GremlinServerError
+from gremlin_python.process.translator import Translator
+
+from models import GraphWriteSession
+
+
+class FakeWriter:
+    """Stands in for GraphWriteSession._write, failing with the given errors first"""
+    
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.attempts = 0
+        self.batches = []
+    
+    def __call__(self, batch):
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.batches.append(list(batch))
+
+
+def make_session(writer, **kwargs):
+    kwargs.setdefault('retry_backoff', 0)
+    session = GraphWriteSession(None, **kwargs)
+    session._write = writer
+    return session
+
+
+def server_error(message):
+    return GremlinServerError({'code': 500, 'message': message, 'attributes': {}})
+
+
+def test_flushes_in_order_when_batch_is_full():
+    writer = FakeWriter()
+    session = make_session(writer, batch_size=2, max_delay=60)
+    for mutation in ['user', 'product', 'purchase']:
+        session._add(mutation)
+    assert writer.batches == [['user', 'product']]
+    assert session.pending == ['purchase']
+    session.flush()
+    assert writer.batches == [['user', 'product'], ['purchase']]
+
+
+def test_flushes_after_max_delay_without_further_writes():
+    writer = FakeWriter()
+    session = make_session(writer, batch_size=100, max_delay=0.05)
+    session._add('user')
+    deadline = time.monotonic() + 2
+    while not writer.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.batches == [['user']]
+    assert session.pending == []
+
+
+def test_timer_error_is_raised_by_next_call():
+    writer = FakeWriter(errors=[ValueError('bad script')])
+    session = make_session(writer, max_delay=0.01)
+    session._add('user')
+    time.sleep(0.2)
+    with pytest.raises(ValueError):
+        session.flush()
+    session.flush()
+    assert writer.batches == [['user']]
+
+
+def test_context_manager_flushes_on_exit():
+    writer = FakeWriter()
+    with make_session(writer, max_delay=60) as session:
+        session._add('user')
+    assert writer.batches == [['user']]
+
+
+def test_context_manager_discards_on_error():
+    writer = FakeWriter()
+    with pytest.raises(RuntimeError):
+        with make_session(writer, max_delay=60) as session:
+            session._add('user')
+            raise RuntimeError('boom')
+    assert writer.batches == []
+    assert session.pending == []
+
+
+@pytest.mark.parametrize('error', [
+    ConnectionResetError('reset'),
+    TimeoutError('timed out'),
+    server_error('ConcurrentModificationException in transaction'),
+])
+def test_retries_transient_errors_once_per_failure(error):
+    writer = FakeWriter(errors=[error])
+    session = make_session(writer, max_delay=60)
+    session._add('user')
+    session.flush()
+    assert writer.attempts == 2
+    assert writer.batches == [['user']]
+
+
+def test_does_not_retry_deterministic_errors():
+    writer = FakeWriter(errors=[server_error('MalformedQueryException')])
+    session = make_session(writer, max_delay=60, max_retries=3)
+    session._add('user')
+    with pytest.raises(GremlinServerError):
+        session.flush()
+    assert writer.attempts == 1
+    assert session.pending == ['user']
+
+
+def test_keeps_batch_after_retries_are_exhausted():
+    writer = FakeWriter(errors=[ConnectionError()] * 3)
+    session = make_session(writer, max_delay=60, max_retries=2)
+    session._add('user')
+    with pytest.raises(ConnectionError):
+        session.flush()
+    assert writer.attempts == 3
+    assert session.pending == ['user']
+
+
+def test_repeat_purchases_get_distinct_keys():
+    session = make_session(FakeWriter(), max_delay=60)
+    session.create_purchase('user1', 'prod1')
+    session.create_purchase('user1', 'prod1')
+    session.create_purchase('user1', 'prod1', purchase_id='order-42')
+    scripts = [Translator('g').translate(m.bytecode) for m in session.pending]
+    keys = [re.search(r"has\('purchaseId','([^']+)'\)", script).group(1) for script in scripts]
+    session.flush()
+    assert len(set(keys)) == 3
+    assert keys[2] == 'order-42'
+
+
+def test_missing_edge_endpoint_fails_the_batch():
+    session = make_session(FakeWriter(), max_delay=60)
+    session.create_friendship('user1', 'ghost')
+    script = Translator('g').translate(session.pending[0].bytecode)
+    session.pending = []
+    assert "coalesce(__.V().has('user','userId','user1'),__.fail('Missing user userId=user1'))" in script
+    assert "coalesce(__.V().has('user','userId','ghost'),__.fail('Missing user userId=ghost'))" in script
+
+
+def test_missing_endpoint_error_is_raised_without_retry():
+    # What Gremlin Server returns when a fail() step is reached
+    writer = FakeWriter(errors=[server_error('fail() Step Triggered: Missing user userId=ghost')])
+    session = make_session(writer, max_delay=60)
+    session.create_friendship('user1', 'ghost')
+    with pytest.raises(GremlinServerError, match='Missing user userId=ghost'):
+        session.flush()
+    assert writer.attempts == 1
+
+
+def test_created_properties_are_only_set_on_insert():
+    session = make_session(FakeWriter(), max_delay=60)
+    session.create_user('user1', 'Alice Johnson', 'alice@email.com', 28)
+    session.create_friendship('user1', 'user2')
+    user, friendship = [Translator('g').translate(m.bytecode) for m in session.pending]
+    session.pending = []
+    
+    insert, updates = user.split(")).property(Cardinality.single,", 1)
+    assert "__.addV('user').property('userId','user1').property('createdAt'," in insert
+    assert 'createdAt' not in updates and "'name','Alice Johnson'" in updates
+    # Friendships have nothing mutable: createdAt only appears in the addE branch
+    assert friendship.endswith("'))")
+    assert "__.addE('friends_with').from('from').property('createdAt'," in friendship
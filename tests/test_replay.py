@@ -0,0 +1,122 @@
+import json
+import time
+
+import pytest
+
+from replay import Replayer, histogram, load_records, main, percentile, schedule, summarize
+
+
+def write_log(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return str(path)
+
+
+def test_load_records_sorts_out_of_order_logs(tmp_path, capsys):
+    log = write_log(tmp_path / 'traffic.jsonl', [
+        {'query': 'users', 'timestamp': 10.0},
+        {'query': 'purchases', 'params': ['user1'], 'timestamp': 9.0},
+        {'query': 'get_all_products', 'timestamp': '1970-01-01T00:00:09.500+00:00'},
+    ])
+    records = load_records(log)
+    assert [r['timestamp'] for r in records] == [9.0, 9.5, 10.0]
+    assert [r['method'] for r in records] == [
+        'get_user_purchases', 'get_all_products', 'get_all_users']
+    assert 'not in timestamp order' in capsys.readouterr().err
+    assert schedule(records) == [0.0, 0.5, 1.0]
+
+
+def test_load_records_rejects_unknown_queries(tmp_path):
+    log = write_log(tmp_path / 'traffic.jsonl', [{'query': 'drop_everything'}])
+    with pytest.raises(ValueError, match='line 1'):
+        load_records(log)
+
+
+def test_schedule_speed_multiplier():
+    records = [{'timestamp': t} for t in (100.0, 101.0, 103.0)]
+    assert schedule(records, speed=2) == [0.0, 0.5, 1.5]
+
+
+def test_schedule_fixed_qps_ignores_timestamps():
+    records = [{'timestamp': None}] * 4
+    assert schedule(records, qps=4) == [0.0, 0.25, 0.5, 0.75]
+
+
+def test_schedule_rejects_missing_or_unsorted_timestamps():
+    with pytest.raises(ValueError, match='timestamp'):
+        schedule([{'timestamp': 1.0}, {'timestamp': None}])
+    with pytest.raises(ValueError, match='order'):
+        schedule([{'timestamp': 2.0}, {'timestamp': 1.0}])
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 99.9) == 100
+    assert percentile([7], 50) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_histogram_power_of_two_buckets():
+    assert histogram([0.5, 1, 1.5, 3, 4, 100]) == {1: 2, 2: 1, 4: 2, 128: 1}
+
+
+def test_summarize_keeps_errors_out_of_latency():
+    samples = [
+        {'query': 'users', 'service_ms': 10.0, 'corrected_ms': 12.0, 'error': None},
+        {'query': 'users', 'service_ms': 20.0, 'corrected_ms': 30.0, 'error': None},
+        {'query': 'users', 'service_ms': 0.1, 'corrected_ms': 0.1, 'error': 'ConnectionError: refused'},
+    ]
+    summary = summarize(samples, elapsed=1.0)
+    assert summary['succeeded'] == 2
+    assert summary['error_rate'] == round(1 / 3, 4)
+    assert summary['corrected_ms']['p50'] == 12.0
+    assert summary['max_ms'] == 30.0
+    assert summary['per_query'] == {'users': {'requests': 3, 'errors': 1}}
+
+
+class SlowSetupReplayer(Replayer):
+    """Clients take a while to build, as a WebSocket connection would"""
+
+    def _make_queries(self):
+        time.sleep(0.1)
+
+        class FakeQueries:
+            def get_all_users(self):
+                return []
+
+        return FakeQueries()
+
+
+def test_client_setup_is_not_measured():
+    records = [{'query': 'users', 'method': 'get_all_users', 'params': []}] * 8
+    samples, _ = SlowSetupReplayer(workers=4).run(records, schedule(records, qps=1000))
+    assert len(samples) == 8
+    assert all(not s['error'] for s in samples)
+    assert max(s['service_ms'] for s in samples) < 50
+
+
+def test_cli_names_get_cli_argument_conversion(tmp_path):
+    log = write_log(tmp_path / 'traffic.jsonl', [
+        {'query': 'popular', 'params': ['3'], 'timestamp': 1.0},
+        {'query': 'high-rated', 'params': ['4.5'], 'timestamp': 2.0},
+        {'query': 'get_popular_products', 'params': {'limit': 2}, 'timestamp': 3.0},
+    ])
+    assert [r['params'] for r in load_records(log)] == [[3], [4.5], {'limit': 2}]
+
+
+def test_bad_cli_params_are_reported_with_line(tmp_path):
+    log = write_log(tmp_path / 'traffic.jsonl', [
+        {'query': 'users'},
+        {'query': 'popular', 'params': ['lots']},
+    ])
+    with pytest.raises(ValueError, match="line 2: popular: invalid argument 'lots'"):
+        load_records(log)
+
+
+@pytest.mark.parametrize('workers', ['0', '-2'])
+def test_rejects_non_positive_workers(tmp_path, workers):
+    log = write_log(tmp_path / 'traffic.jsonl', [{'query': 'users', 'timestamp': 1.0}])
+    with pytest.raises(SystemExit) as exit_info:
+        main([log, '--workers', workers])
+    assert exit_info.value.code == 2
@@ -0,0 +1,61 @@
+import pytest
+
+import cli
+import sample_data
+from sample_data import ensure_sample_data, sample_fingerprint
+
+
+def stub_server(monkeypatch, fingerprint):
+    loads = []
+    if isinstance(fingerprint, Exception):
+        def get_fingerprint(url):
+            raise fingerprint
+    else:
+        def get_fingerprint(url):
+            return fingerprint
+    monkeypatch.setattr(sample_data, 'get_fingerprint', get_fingerprint)
+    monkeypatch.setattr(sample_data, 'populate_sample_data', loads.append)
+    return loads
+
+
+def test_sample_fingerprint_counts():
+    assert sample_fingerprint() == {
+        'vertices': {'user': 5, 'product': 6},
+        'edges': {'friends_with': 5, 'purchased': 10, 'recommended': 5},
+    }
+
+
+def test_skips_reload_when_fingerprint_matches(monkeypatch):
+    loads = stub_server(monkeypatch, sample_fingerprint())
+    assert ensure_sample_data('http://graph:8182') is False
+    assert loads == []
+
+
+def test_reloads_when_fingerprint_differs(monkeypatch):
+    changed = sample_fingerprint()
+    changed['edges']['purchased'] -= 1
+    loads = stub_server(monkeypatch, changed)
+    assert ensure_sample_data('http://graph:8182') is True
+    assert loads == ['http://graph:8182']
+
+
+def test_force_reloads(monkeypatch):
+    loads = stub_server(monkeypatch, sample_fingerprint())
+    assert ensure_sample_data('http://graph:8182', force=True) is True
+    assert loads == ['http://graph:8182']
+
+
+def test_unreachable_server_raises(monkeypatch):
+    loads = stub_server(monkeypatch, ConnectionRefusedError('refused'))
+    with pytest.raises(ConnectionRefusedError):
+        ensure_sample_data('http://graph:8182')
+    assert loads == []
+
+
+@pytest.mark.parametrize('command', [['load'], ['shell']])
+def test_cli_exits_non_zero_when_server_is_down(monkeypatch, capsys, command):
+    stub_server(monkeypatch, ConnectionRefusedError('refused'))
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['--url', 'http://graph:8182'] + command)
+    assert exit_info.value.code == "Failed to connect to Gremlin server: refused"
+    assert capsys.readouterr().out == ""
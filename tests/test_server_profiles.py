@@ -0,0 +1,48 @@
+import pytest
+import yaml
+
+from server_profiles import PROFILES, build_config, write_profile
+
+
+def serializer_names(config):
+    return [s['className'].rsplit('.', 1)[1] for s in config['serializers']]
+
+
+@pytest.mark.parametrize('profile', list(PROFILES))
+def test_profile_settings_override_base(profile):
+    config = build_config(profile)
+    for key, value in PROFILES[profile]['settings'].items():
+        assert config[key] == value
+    # Everything else comes from the base config
+    assert config['channelizer'].endswith('HttpChannelizer')
+
+
+def test_serializer_ordering():
+    assert serializer_names(build_config('oltp-reads'))[0] == 'GraphSONUntypedMessageSerializerV3'
+    assert serializer_names(build_config('bulk-load'))[0] == 'GraphSONMessageSerializerV3'
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError, match='Unknown profile'):
+        build_config('nightly')
+
+
+def test_written_profile_round_trips(tmp_path):
+    path = write_profile('analytics', output=str(tmp_path / 'analytics.yaml'))
+    with open(path) as f:
+        assert yaml.safe_load(f) == build_config('analytics')
+
+
+def test_profiles_are_written_next_to_their_base(tmp_path):
+    base = tmp_path / 'gremlin-server.yaml'
+    base.write_text("# Licensed to the ASF\n# under the License.\n\nhost: 0.0.0.0\nserializers: []\n")
+    path = write_profile('oltp-reads', base_config=str(base))
+    assert path == str(tmp_path / 'gremlin-server-oltp-reads.yaml')
+    with open(path) as f:
+        text = f.read()
+    assert text.startswith("# Licensed to the ASF\n# under the License.\n\n# Generated by")
+
+
+def test_output_dir_overrides_base_directory(tmp_path):
+    path = write_profile('bulk-load', output_dir=str(tmp_path))
+    assert path == str(tmp_path / 'gremlin-server-bulk-load.yaml')